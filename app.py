@@ -1,9 +1,9 @@
-import json
 import uuid
 import asyncio
+import sqlite3
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor
 
+import orjson
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request
 from fastapi.responses import FileResponse, JSONResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
@@ -12,12 +12,12 @@ from pydantic import BaseModel
 from ssh_manager import SSHManager
 from config import settings
 from auth import check_password, create_session, verify_session
-from middleware import IPAllowlistMiddleware, AuthMiddleware
+from middleware import IPAllowlistMiddleware, AuthMiddleware, get_client_ip
 
 app = FastAPI()
-executor = ThreadPoolExecutor(max_workers=8)
 
-COMMANDS_FILE = Path(__file__).parent / "saved_commands.json"
+COMMANDS_FILE = Path(__file__).parent / "saved_commands.json"  # legacy, imported once
+COMMANDS_DB = Path(__file__).parent / "commands.db"
 
 
 # --- Middleware (opt-in, only active when env vars are set) ---
@@ -25,13 +25,13 @@ COMMANDS_FILE = Path(__file__).parent / "saved_commands.json"
 if settings.allowed_ips:
     app.add_middleware(
         IPAllowlistMiddleware,
-        allowed_networks=settings.allowed_networks,
+        allowed_ranges=settings.allowed_ranges,
+        trust_proxy=settings.trust_proxy_headers,
     )
 
 if settings.auth_enabled:
     app.add_middleware(
         AuthMiddleware,
-        secret_key=settings.secret_key,
         max_age_seconds=settings.session_timeout_minutes * 60,
     )
 
@@ -56,7 +56,7 @@ async def login(request: Request):
     if not check_password(password):
         return JSONResponse({"detail": "Invalid password"}, status_code=401)
 
-    token = create_session(settings.secret_key, settings.session_timeout_minutes)
+    token = create_session()
     response = JSONResponse({"ok": True})
     response.set_cookie(
         key="ssh_terminal_session",
@@ -86,6 +86,36 @@ async def root():
 app.mount("/static", StaticFiles(directory=Path(__file__).parent / "static"), name="static")
 
 
+# --- WebSocket control-message handlers ---
+#
+# Dispatch table instead of an if/elif ladder: one dict lookup per
+# control message, and new types (signal, paste, ...) slot in without
+# regrowing the branch chain. A handler returns False to end the session.
+
+async def _handle_resize(parsed, manager):
+    cols = int(parsed.get("cols", 120))
+    rows = int(parsed.get("rows", 30))
+    # Rare and briefly blocking — a one-shot thread is fine here
+    await asyncio.to_thread(manager.resize, cols, rows)
+    return True
+
+
+async def _handle_input(parsed, manager):
+    await manager.awrite(parsed["data"].encode("utf-8"))
+    return True
+
+
+async def _handle_disconnect(parsed, manager):
+    return False
+
+
+_control_handlers = {
+    "resize": _handle_resize,
+    "input": _handle_input,
+    "disconnect": _handle_disconnect,
+}
+
+
 # --- WebSocket SSH endpoint ---
 
 @app.websocket("/ws/ssh")
@@ -94,22 +124,24 @@ async def ssh_websocket(websocket: WebSocket):
     if settings.auth_enabled:
         cookie_value = websocket.cookies.get("ssh_terminal_session")
         max_age = settings.session_timeout_minutes * 60
-        if not cookie_value or not verify_session(cookie_value, settings.secret_key, max_age):
+        if not cookie_value or not verify_session(cookie_value, max_age):
             await websocket.close(code=4401, reason="Unauthorized")
             return
 
     # --- IP check for WebSocket ---
-    if settings.allowed_ips and not settings.is_ip_allowed(websocket.client.host):
+    client_ip = get_client_ip(websocket, settings.trust_proxy_headers)
+    if settings.allowed_ips and not settings.is_ip_allowed(client_ip):
         await websocket.close(code=4403, reason="Forbidden")
         return
 
     await websocket.accept()
     manager = SSHManager()
-    loop = asyncio.get_event_loop()
+    loop = asyncio.get_running_loop()
 
     try:
-        # Wait for connection details (JSON message)
-        connect_msg = await websocket.receive_json()
+        # Wait for connection details (JSON message) — parsed with orjson,
+        # which takes the raw text directly and is much faster than stdlib
+        connect_msg = orjson.loads(await websocket.receive_text())
 
         if connect_msg.get("type") != "connect":
             await websocket.send_json({"type": "error", "data": "Expected connect message"})
@@ -138,13 +170,49 @@ async def ssh_websocket(websocket: WebSocket):
         # --- Concurrent streaming tasks ---
 
         async def ssh_to_ws():
-            """Read SSH channel output and forward to WebSocket."""
+            """Forward SSH channel output to the WebSocket.
+
+            manager.read_async() wakes on kernel readiness — no executor
+            round-trips and no polling sleep between reads.
+
+            Output is coalesced into a bounded buffer and flushed as one
+            frame once it reaches 32 KiB or 5 ms after its first byte,
+            whichever comes first — big bursts become a few large frames
+            instead of hundreds of tiny ones, without hurting echo latency.
+            """
+            FLUSH_BYTES = 32 * 1024
+            FLUSH_SECONDS = 0.005
+            buf = bytearray()
+            first_ts = 0.0
             while manager.is_active():
-                data = await loop.run_in_executor(executor, manager.read)
-                if data:
-                    await websocket.send_text(data.decode("utf-8", errors="replace"))
+                if buf:
+                    # Partial buffer pending — wait for more data, but
+                    # only until the flush deadline.
+                    remaining = FLUSH_SECONDS - (loop.time() - first_ts)
+                    data = await manager.read_async(timeout=max(remaining, 0))
                 else:
-                    await asyncio.sleep(0.02)
+                    data = await manager.read_async()
+
+                if data is None:
+                    # Channel closed (EOF or transport error) — flush
+                    # whatever is pending and stop
+                    if buf:
+                        await websocket.send_bytes(bytes(buf))
+                    break
+
+                if data:
+                    if not buf:
+                        first_ts = loop.time()
+                    buf.extend(data)
+
+                if buf and (
+                    len(buf) >= FLUSH_BYTES
+                    or loop.time() - first_ts >= FLUSH_SECONDS
+                ):
+                    # Binary frame — xterm.js consumes raw bytes, so
+                    # skip the decode/re-encode round trip entirely.
+                    await websocket.send_bytes(bytes(buf))
+                    buf.clear()
 
         async def ws_to_ssh():
             """Read WebSocket messages and forward to SSH channel."""
@@ -156,32 +224,32 @@ async def ssh_websocket(websocket: WebSocket):
                 if msg.get("type") == "websocket.disconnect":
                     break
 
-                text = msg.get("text", "")
-                if text:
-                    try:
-                        parsed = json.loads(text)
-                        if isinstance(parsed, dict):
-                            if parsed.get("type") == "resize":
-                                cols = int(parsed.get("cols", 120))
-                                rows = int(parsed.get("rows", 30))
-                                await loop.run_in_executor(
-                                    executor,
-                                    lambda: manager.resize(cols, rows)
-                                )
-                                continue
-                            elif parsed.get("type") == "disconnect":
-                                break
-                            elif parsed.get("type") == "input":
-                                manager.write(parsed["data"].encode("utf-8"))
-                                continue
-                    except (json.JSONDecodeError, ValueError):
-                        pass
-
-                    manager.write(text.encode("utf-8"))
-
+                # Fast path: keystrokes arrive as binary frames and go to
+                # the channel untouched — no JSON sniffing, no re-encode.
+                # Text frames are reserved for control messages.
                 bdata = msg.get("bytes")
                 if bdata:
-                    manager.write(bdata)
+                    await manager.awrite(bdata)
+                    continue
+
+                text = msg.get("text", "")
+                if text:
+                    # Cheap prefilter: control messages are JSON objects, so
+                    # only attempt a parse when the frame could be one. Plain
+                    # keystrokes skip the json.loads/JSONDecodeError cycle.
+                    if text[0] == "{":
+                        try:
+                            parsed = orjson.loads(text)
+                            if isinstance(parsed, dict):
+                                handler = _control_handlers.get(parsed.get("type"))
+                                if handler is not None:
+                                    if await handler(parsed, manager):
+                                        continue
+                                    break
+                        except (orjson.JSONDecodeError, ValueError):
+                            pass
+
+                    await manager.awrite(text.encode("utf-8"))
 
         async def idle_watchdog():
             """Close connection if idle too long (only when auth is enabled)."""
@@ -227,23 +295,48 @@ async def ssh_websocket(websocket: WebSocket):
 
 
 # --- Saved commands REST API ---
-
-def _load_commands():
-    try:
-        with open(COMMANDS_FILE) as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return []
+#
+# Stored in SQLite (stdlib, no extra deps). Mutations are single-row
+# statements — no more rewriting and re-serializing the whole JSON file
+# per POST/DELETE — and WAL mode lets reads proceed during a write. A
+# legacy saved_commands.json is imported into the database on first run.
+
+def _open_commands_db():
+    conn = sqlite3.connect(COMMANDS_DB, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS commands("
+        "id TEXT PRIMARY KEY, label TEXT, cmd TEXT, category TEXT)"
+    )
+    if conn.execute("SELECT COUNT(*) FROM commands").fetchone()[0] == 0:
+        try:
+            with open(COMMANDS_FILE, "rb") as f:
+                legacy = orjson.loads(f.read())
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            legacy = []
+        if legacy:
+            conn.executemany(
+                "INSERT OR IGNORE INTO commands VALUES (?, ?, ?, ?)",
+                [
+                    (c["id"], c["label"], c["cmd"], c.get("category", "General"))
+                    for c in legacy
+                ],
+            )
+            conn.commit()
+    return conn
 
 
-def _save_commands(commands):
-    with open(COMMANDS_FILE, "w") as f:
-        json.dump(commands, f, indent=2)
+_commands_db = _open_commands_db()
 
 
 @app.get("/api/commands")
 async def get_commands():
-    return _load_commands()
+    rows = _commands_db.execute(
+        "SELECT id, label, cmd, category FROM commands"
+    ).fetchall()
+    return [
+        {"id": r[0], "label": r[1], "cmd": r[2], "category": r[3]} for r in rows
+    ]
 
 
 class CommandCreate(BaseModel):
@@ -254,23 +347,24 @@ class CommandCreate(BaseModel):
 
 @app.post("/api/commands")
 async def add_command(command: CommandCreate):
-    commands = _load_commands()
     new_cmd = {
         "id": str(uuid.uuid4())[:8],
         "label": command.label,
         "cmd": command.cmd,
         "category": command.category,
     }
-    commands.append(new_cmd)
-    _save_commands(commands)
+    _commands_db.execute(
+        "INSERT INTO commands VALUES (?, ?, ?, ?)",
+        (new_cmd["id"], new_cmd["label"], new_cmd["cmd"], new_cmd["category"]),
+    )
+    _commands_db.commit()
     return new_cmd
 
 
 @app.delete("/api/commands/{cmd_id}")
 async def delete_command(cmd_id: str):
-    commands = _load_commands()
-    commands = [c for c in commands if c["id"] != cmd_id]
-    _save_commands(commands)
+    _commands_db.execute("DELETE FROM commands WHERE id = ?", (cmd_id,))
+    _commands_db.commit()
     return {"ok": True}
 
 
@@ -283,6 +377,9 @@ if __name__ == "__main__":
         "app": "app:app",
         "host": settings.host,
         "port": settings.port,
+        # libuv-backed event loop — noticeably faster socket I/O for the
+        # WebSocket bridge than the default selector loop
+        "loop": "uvloop",
     }
 
     if settings.ssl_certfile and settings.ssl_keyfile:
@@ -7,6 +7,16 @@ from config import settings
 
 SALT = "ssh-terminal-session"
 
+# One serializer for the process, bound to the configured secret key —
+# constructing it per call re-derives signing state every time
+_serializer = URLSafeTimedSerializer(settings.secret_key)
+
+# Verified-token cache: token -> absolute expiry timestamp. A page load
+# re-verifies the same cookie once per asset, so cache the HMAC result
+# and reduce repeat verifications to a dict lookup + float compare.
+_SESSION_CACHE_MAX = 1024
+_session_cache: dict[str, float] = {}
+
 
 def check_password(provided: str) -> bool:
     """
@@ -19,23 +29,33 @@ def check_password(provided: str) -> bool:
     return hmac.compare_digest(provided.encode("utf-8"), expected.encode("utf-8"))
 
 
-def create_session(secret_key: str, timeout_minutes: int) -> str:
+def create_session() -> str:
     """
     Create a signed session token with an embedded timestamp.
     The token is URL-safe and tamper-proof.
     """
-    s = URLSafeTimedSerializer(secret_key)
-    return s.dumps({"created": time.time()}, salt=SALT)
+    return _serializer.dumps({"created": time.time()}, salt=SALT)
 
 
-def verify_session(token: str, secret_key: str, max_age_seconds: int = 1800) -> bool:
+def verify_session(token: str, max_age_seconds: int = 1800) -> bool:
     """
     Verify a session token's signature and check it hasn't expired.
     Returns True if valid, False if tampered, expired, or malformed.
     """
-    s = URLSafeTimedSerializer(secret_key)
-    try:
-        s.loads(token, salt=SALT, max_age=max_age_seconds)
+    expiry = _session_cache.get(token)
+    if expiry is not None and time.time() < expiry:
         return True
+
+    try:
+        _, timestamp = _serializer.loads(
+            token, salt=SALT, max_age=max_age_seconds, return_timestamp=True
+        )
     except (BadSignature, SignatureExpired):
         return False
+
+    # Cache the token's real expiry (issue time + max age), bounded so a
+    # flood of unique tokens can't grow the dict without limit
+    if len(_session_cache) >= _SESSION_CACHE_MAX:
+        _session_cache.clear()
+    _session_cache[token] = timestamp.timestamp() + max_age_seconds
+    return True
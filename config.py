@@ -1,4 +1,5 @@
 import os
+import bisect
 import secrets
 import ipaddress
 from pathlib import Path
@@ -9,6 +10,44 @@ from dotenv import load_dotenv
 load_dotenv(Path(__file__).parent / ".env")
 
 
+def build_ip_ranges(networks):
+    """
+    Collapse network objects into sorted, merged (low, high) integer ranges,
+    keyed by IP version. Integer compares are far cheaper per request than
+    IPv4Address.__contains__, and merging makes binary search correct even
+    when configured networks overlap.
+    """
+    by_version = {4: [], 6: []}
+    for net in networks:
+        by_version[net.version].append(
+            [int(net.network_address), int(net.broadcast_address)]
+        )
+    result = {}
+    for version, ranges in by_version.items():
+        ranges.sort()
+        merged = []
+        for low, high in ranges:
+            if merged and low <= merged[-1][1] + 1:
+                merged[-1][1] = max(merged[-1][1], high)
+            else:
+                merged.append([low, high])
+        lows = [low for low, _ in merged]
+        result[version] = (lows, merged)
+    return result
+
+
+def ip_in_ranges(ip_str: str, ranges_by_version) -> bool:
+    """Binary-search the merged ranges for the address's version."""
+    try:
+        addr = ipaddress.ip_address(ip_str)
+    except ValueError:
+        return False
+    lows, ranges = ranges_by_version[addr.version]
+    ip_int = int(addr)
+    i = bisect.bisect_right(lows, ip_int) - 1
+    return i >= 0 and ip_int <= ranges[i][1]
+
+
 class Settings:
     """
     Centralized configuration loaded from environment variables.
@@ -36,6 +75,9 @@ class Settings:
         raw_ips: str = os.environ.get("SSH_TERMINAL_ALLOWED_IPS", "")
         self.allowed_ips: str = raw_ips
         self.allowed_networks = self._parse_networks(raw_ips) if raw_ips else []
+        # Pre-computed integer ranges — the per-request check is a bisect
+        # plus two int compares instead of an O(N) network-object scan
+        self.allowed_ranges = build_ip_ranges(self.allowed_networks)
 
         # --- Server ---
         self.host: str = os.environ.get("SSH_TERMINAL_HOST", "0.0.0.0")
@@ -45,6 +87,14 @@ class Settings:
         self.ssl_certfile: str = os.environ.get("SSH_TERMINAL_SSL_CERT", "")
         self.ssl_keyfile: str = os.environ.get("SSH_TERMINAL_SSL_KEY", "")
 
+        # --- Reverse proxy (opt-in) ---
+        # When running behind nginx/Caddy, trust X-Forwarded-For so the
+        # IP allowlist sees the real client address, not the proxy's.
+        # Only enable when the app is reachable exclusively via the proxy.
+        self.trust_proxy_headers: bool = os.environ.get(
+            "SSH_TERMINAL_TRUST_PROXY", ""
+        ).lower() in ("1", "true", "yes")
+
     def _parse_networks(self, raw: str):
         """Parse comma-separated IPs and CIDRs into network objects."""
         networks = []
@@ -61,11 +111,7 @@ class Settings:
         """Check if an IP address is in the allowlist. Returns True if no allowlist is set."""
         if not self.allowed_networks:
             return True
-        try:
-            addr = ipaddress.ip_address(ip_str)
-            return any(addr in network for network in self.allowed_networks)
-        except ValueError:
-            return False
+        return ip_in_ranges(ip_str, self.allowed_ranges)
 
     @property
     def auth_enabled(self) -> bool:
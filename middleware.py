@@ -1,10 +1,32 @@
-import ipaddress
-
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import JSONResponse, RedirectResponse
 
 from auth import verify_session
+from config import ip_in_ranges
+
+
+def get_client_ip(request, trust_proxy: bool = False) -> str:
+    """
+    Resolve the real client IP. When the app is explicitly configured to
+    trust its reverse proxy, honour X-Forwarded-For; otherwise use the
+    direct peer address.
+
+    Only the *last* (rightmost) entry is used: that is the one hop our
+    trusted proxy appended itself. Earlier entries arrive in the
+    client's request and are attacker-controlled — with nginx's usual
+    $proxy_add_x_forwarded_for (which appends to any client-supplied
+    header), trusting the first entry would let anyone spoof an
+    allowlisted IP.
+
+    Works for both HTTP requests and WebSockets (both expose .headers
+    and .client).
+    """
+    if trust_proxy:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.rsplit(",", 1)[-1].strip()
+    return request.client.host
 
 
 class IPAllowlistMiddleware(BaseHTTPMiddleware):
@@ -13,59 +35,60 @@ class IPAllowlistMiddleware(BaseHTTPMiddleware):
     Only active when SSH_TERMINAL_ALLOWED_IPS is set.
     """
 
-    def __init__(self, app, allowed_networks):
+    def __init__(self, app, allowed_ranges, trust_proxy: bool = False):
         super().__init__(app)
-        self.allowed_networks = allowed_networks
+        # Sorted, merged (low, high) integer ranges from config.build_ip_ranges
+        self.allowed_ranges = allowed_ranges
+        self.trust_proxy = trust_proxy
 
     async def dispatch(self, request: Request, call_next):
-        client_ip = request.client.host
-        try:
-            addr = ipaddress.ip_address(client_ip)
-            if not any(addr in net for net in self.allowed_networks):
-                return JSONResponse({"detail": "Forbidden"}, status_code=403)
-        except ValueError:
+        client_ip = get_client_ip(request, self.trust_proxy)
+        if not ip_in_ranges(client_ip, self.allowed_ranges):
             return JSONResponse({"detail": "Forbidden"}, status_code=403)
 
         return await call_next(request)
 
 
+# Paths that never need a session check. Static assets are by far the
+# highest-frequency case (every asset on every page load), so the prefix
+# test runs before any cookie or signature work. Module-level tuple —
+# str.startswith on a tuple of literals is a single optimized call.
+EXEMPT_PREFIXES = ("/static/", "/login", "/api/auth/")
+
+
 class AuthMiddleware(BaseHTTPMiddleware):
     """
     Redirects unauthenticated HTTP requests to /login.
     Only active when SSH_TERMINAL_ADMIN_PASSWORD is set.
 
-    Exempt paths (no auth required):
+    Exempt prefixes (no auth required):
+    - /static/ (assets, including the login page's)
     - /login (the login page itself)
-    - /api/auth/* (login/logout endpoints)
+    - /api/auth/ (login/logout endpoints)
     """
 
-    EXEMPT_PATHS = {"/login", "/api/auth/login", "/api/auth/logout"}
-
-    def __init__(self, app, secret_key: str, max_age_seconds: int = 1800):
+    def __init__(self, app, max_age_seconds: int = 1800):
         super().__init__(app)
-        self.secret_key = secret_key
         self.max_age_seconds = max_age_seconds
 
     async def dispatch(self, request: Request, call_next):
-        path = request.url.path
-
-        # Let exempt paths through
-        if path in self.EXEMPT_PATHS:
-            return await call_next(request)
+        # Raw ASGI scope path — request.url would build and parse a URL
+        # object just to read the path back out
+        path = request.scope["path"]
 
-        # Let login page static assets through (if any)
-        if path.startswith("/static/login"):
+        # Fast path: exempt prefixes skip the cookie lookup entirely
+        if path.startswith(EXEMPT_PREFIXES):
             return await call_next(request)
 
         # Check session cookie
         token = request.cookies.get("ssh_terminal_session")
-        if not token or not verify_session(token, self.secret_key, self.max_age_seconds):
-            return self._unauthorized(request)
+        if not token or not verify_session(token, self.max_age_seconds):
+            return self._unauthorized(path)
 
         return await call_next(request)
 
-    def _unauthorized(self, request: Request):
+    def _unauthorized(self, path: str):
         """API requests get 401 JSON; browser requests get redirected to /login."""
-        if request.url.path.startswith("/api/") or request.url.path.startswith("/ws/"):
+        if path.startswith("/api/") or path.startswith("/ws/"):
             return JSONResponse({"detail": "Unauthorized"}, status_code=401)
         return RedirectResponse("/login", status_code=302)
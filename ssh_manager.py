@@ -1,10 +1,232 @@
-import paramiko
+import asyncio
+import hashlib
 import logging
-from io import StringIO
+import os
+import socket
+import threading
+from functools import lru_cache
 from socket import timeout as socket_timeout
 
 logger = logging.getLogger("ssh_manager")
 
+# paramiko drags in cryptography, bcrypt, and pynacl — a noticeable chunk
+# of import time and resident memory — so defer loading it until the
+# first SSH session is actually created.
+paramiko = None
+
+
+def _import_paramiko():
+    global paramiko
+    if paramiko is None:
+        import paramiko
+    return paramiko
+
+
+def _open_socket(host, port, timeout=10):
+    """
+    Pre-build the TCP socket instead of letting paramiko create one with
+    OS defaults: Nagle off (otherwise up to 40 ms of coalescing delay per
+    keystroke echo) and large send/recv buffers so bulk output can fill
+    the bandwidth-delay product on fat or long links.
+
+    The buffer sizes must be set *before* connect(): the TCP window
+    scale factor is fixed when the SYN goes out, so enlarging SO_RCVBUF
+    on an already-connected socket cannot widen the advertised window.
+    The other options are applied after the handshake, mirroring
+    socket.create_connection's address-fallback loop.
+    """
+    last_error = None
+    addresses = socket.getaddrinfo(
+        host, port, socket.AF_UNSPEC, socket.SOCK_STREAM
+    )
+    for family, socktype, proto, _, addr in addresses:
+        sock = socket.socket(family, socktype, proto)
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 32 * 1024 * 1024)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 32 * 1024 * 1024)
+            sock.settimeout(timeout)
+            sock.connect(addr)
+        except OSError as e:
+            last_error = e
+            sock.close()
+            continue
+        break
+    else:
+        if last_error is not None:
+            raise last_error
+        raise OSError(f"getaddrinfo returned no addresses for {host!r}")
+
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    # TCP keepalives so a silently dropped peer (laptop sleep, wifi drop,
+    # yanked cable) fails the socket within ~a minute instead of the
+    # kernel default of two hours. Probe knobs are platform-specific, so
+    # each is guarded — macOS lacks some of the Linux names.
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 30)
+    if hasattr(socket, "TCP_KEEPINTVL"):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 10)
+    if hasattr(socket, "TCP_KEEPCNT"):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 3)
+    if hasattr(socket, "TCP_USER_TIMEOUT"):
+        # Linux only: cap how long unacknowledged data may sit in the
+        # send queue (20 s) before the connection is declared dead
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_USER_TIMEOUT, 20000)
+    return sock
+
+
+# Live transports keyed by (host, port, username, auth fingerprint). SSH
+# multiplexes many channels over one transport, so only the first shell
+# to a host pays the TCP + key-exchange + auth cost — reconnects and
+# extra tabs to the same host just open another channel.
+_POOL = {}
+_POOL_LOCK = threading.Lock()
+
+
+def _auth_fingerprint(password, key_path, key_data):
+    """
+    Digest of the credential material used for the pool key, so a
+    transport is only ever reused for identical auth — a changed password
+    or different key gets a fresh handshake.
+    """
+    h = hashlib.sha256()
+    if key_data:
+        h.update(b"key-data\0" + key_data.encode("utf-8"))
+        if password:
+            h.update(password.encode("utf-8"))
+    elif key_path:
+        h.update(b"key-path\0" + key_path.encode("utf-8"))
+    else:
+        h.update(b"password\0" + (password or "").encode("utf-8"))
+    return h.hexdigest()
+
+
+_HOST_KEYS = None
+_ADD_POLICY = None
+
+
+def _shared_host_keys():
+    """
+    Process-wide HostKeys loaded from ~/.ssh/known_hosts once — on admin
+    boxes that file can run to thousands of lines, and re-parsing it per
+    connect is O(file size) for no benefit. Newly seen host keys are
+    recorded in memory only (this app never verified or persisted them
+    before either; see the README security notes).
+    """
+    global _HOST_KEYS, _ADD_POLICY
+    if _HOST_KEYS is None:
+        _HOST_KEYS = paramiko.HostKeys()
+        known_hosts = os.path.expanduser("~/.ssh/known_hosts")
+        if os.path.exists(known_hosts):
+            try:
+                _HOST_KEYS.load(known_hosts)
+            except (OSError, paramiko.SSHException) as e:
+                logger.debug("Could not load known_hosts: %s", e)
+
+        class _InMemoryAddPolicy(paramiko.MissingHostKeyPolicy):
+            """AutoAddPolicy without the disk write-back."""
+
+            def missing_host_key(self, client, hostname, key):
+                _HOST_KEYS.add(hostname, key.get_name(), key)
+
+        _ADD_POLICY = _InMemoryAddPolicy()
+    return _HOST_KEYS, _ADD_POLICY
+
+
+@lru_cache(maxsize=16)
+def _load_key_file(path, mtime_ns):
+    """
+    Parse a private key file, trying each supported type (the RSAKey-only
+    loader used before failed on Ed25519/ECDSA/DSA files). Cached on
+    (path, mtime_ns): repeated connects with the same key skip the PEM
+    decode entirely, while an edited file changes mtime and re-parses.
+    """
+    key_classes = [
+        paramiko.Ed25519Key,
+        paramiko.ECDSAKey,
+        paramiko.RSAKey,
+    ]
+    if hasattr(paramiko, "DSSKey"):  # removed in paramiko 4.0
+        key_classes.append(paramiko.DSSKey)
+    last_error = None
+    for key_class in key_classes:
+        try:
+            return key_class.from_private_key_file(path)
+        except (paramiko.SSHException, ValueError) as e:
+            last_error = e
+            continue
+    raise paramiko.SSHException(
+        f"Could not load key file — unsupported key type or invalid format: {last_error}"
+    )
+
+
+# AEAD ciphers first: GCM/ChaCha20 fold the MAC into the cipher pass
+# (one sweep over the data instead of encrypt + separate HMAC), and both
+# map onto hardware instructions (AES-NI, vector ChaCha) in OpenSSL.
+# Bulk PTY output is mostly cipher time, so this is close to free
+# throughput. Anything not listed keeps its paramiko-default ordering
+# as fallback for servers without AEAD support.
+_PREFERRED_CIPHERS = (
+    "aes128-gcm@openssh.com",
+    "chacha20-poly1305@openssh.com",
+    "aes256-gcm@openssh.com",
+)
+
+
+def _transport_factory(sock, **kwargs):
+    """
+    Build the Transport ourselves (SSHClient.connect hands us the socket)
+    so cipher preferences are set before key exchange starts — after
+    connect() returns, the negotiation has already happened.
+    """
+    transport = paramiko.Transport(sock, **kwargs)
+    opts = transport.get_security_options()
+    preferred = [c for c in _PREFERRED_CIPHERS if c in opts.ciphers]
+    if preferred:
+        opts.ciphers = tuple(
+            preferred + [c for c in opts.ciphers if c not in preferred]
+        )
+    # Never negotiate compression for the PTY stream: keystroke-sized
+    # packets compress to roughly their own size, so zlib would add a
+    # deflate per write and an inflate per read for nothing. (Worth
+    # revisiting only if this ever carries bulk file transfer over a
+    # slow link.)
+    opts.compression = ("none",)
+    return transport
+
+
+# paramiko's defaults leave 15–30 s per connect phase, so a wedged or
+# slow-to-answer server keeps the "Connecting..." spinner up for the
+# better part of a minute. Bound every phase — TCP connect, protocol
+# banner, auth exchange, channel open — at 5 s each so failures surface
+# while the user is still looking at the screen. The worst case is the
+# sum of phases, not one shared budget.
+_CONNECT_TIMEOUT = 5
+_CONNECT_TIMEOUTS = {
+    "timeout": _CONNECT_TIMEOUT,
+    "banner_timeout": _CONNECT_TIMEOUT,
+    "auth_timeout": _CONNECT_TIMEOUT,
+    "channel_timeout": _CONNECT_TIMEOUT,
+}
+
+
+def _pooled_transport(pool_key):
+    """Return a live pooled transport for the key, evicting dead entries."""
+    with _POOL_LOCK:
+        entry = _POOL.get(pool_key)
+        if entry is None:
+            return None
+        client, transport = entry
+        if transport.is_active():
+            return transport
+        del _POOL[pool_key]
+    try:
+        client.close()
+    except Exception:
+        pass
+    return None
+
 
 class SSHManager:
     """
@@ -19,10 +241,22 @@ class SSHManager:
     """
 
     def __init__(self):
-        self.client = paramiko.SSHClient()
-        self.client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        _import_paramiko()
+        # The SSHClient (which owns a Transport and HostKeys dict) is
+        # only built inside connect() on a pool miss — managers that
+        # never connect, or that reuse a pooled transport, stay cheap.
+        self.client = None
         self.connected = False
         self.channel = None
+        self._transport = None
+        self._read_event = None
+        self._read_fd = None
+        self._wbuf = bytearray()  # coalesced small writes awaiting flush
+        self._wflush_handle = None
+        self._wlock = asyncio.Lock()  # serializes channel sends
+        # True when this manager's transport is not in the pool (it lost
+        # an insert race), so disconnect() must close it itself
+        self._owns_client = False
 
     def _load_key_from_data(self, key_data, password=None):
         """
@@ -30,12 +264,15 @@ class SSHManager:
         Supports RSA, Ed25519, ECDSA, and DSA key types.
         Returns a paramiko key object or raises an exception.
         """
+        from io import StringIO
+
         key_classes = [
             paramiko.RSAKey,
             paramiko.Ed25519Key,
             paramiko.ECDSAKey,
-            paramiko.DSSKey,
         ]
+        if hasattr(paramiko, "DSSKey"):  # removed in paramiko 4.0
+            key_classes.append(paramiko.DSSKey)
         last_error = None
         for key_class in key_classes:
             try:
@@ -54,70 +291,357 @@ class SSHManager:
         """
         Connect to remote server and open a PTY shell.
         Auth priority: key_data (uploaded) > key_path (file) > password.
+        Reuses a pooled transport to the same (host, port, username,
+        credentials) when one is still alive — only the first session
+        pays the handshake.
         Returns (success, error_message).
         """
+        pool_key = (
+            host, port, username,
+            _auth_fingerprint(password, key_path, key_data),
+        )
+        sock = None
+        pooled = False
         try:
-            if key_data:
-                # In-memory key from browser upload (never touches disk)
-                key = self._load_key_from_data(key_data, password=password)
-                self.client.connect(
-                    host, port=port, username=username, pkey=key, timeout=10
-                )
-            elif key_path:
-                key = paramiko.RSAKey.from_private_key_file(key_path)
-                self.client.connect(
-                    host, port=port, username=username, pkey=key, timeout=10
+            transport = _pooled_transport(pool_key)
+            if transport is None:
+                self.client = paramiko.SSHClient()
+                host_keys, policy = _shared_host_keys()
+                self.client._host_keys = host_keys
+                self.client.set_missing_host_key_policy(policy)
+                sock = _open_socket(host, port, timeout=_CONNECT_TIMEOUT)
+                if key_data:
+                    # In-memory key from browser upload (never touches disk)
+                    key = self._load_key_from_data(key_data, password=password)
+                    self.client.connect(
+                        host, port=port, username=username, pkey=key,
+                        sock=sock, **_CONNECT_TIMEOUTS,
+                        transport_factory=_transport_factory,
+                    )
+                elif key_path:
+                    key = _load_key_file(key_path, os.stat(key_path).st_mtime_ns)
+                    self.client.connect(
+                        host, port=port, username=username, pkey=key,
+                        sock=sock, **_CONNECT_TIMEOUTS,
+                        transport_factory=_transport_factory,
+                    )
+                else:
+                    self.client.connect(
+                        host, port=port, username=username, password=password,
+                        sock=sock, **_CONNECT_TIMEOUTS,
+                        transport_factory=_transport_factory,
+                    )
+
+                # Lift the SSH flow-control window and packet cap before
+                # the shell channel opens — with the defaults, bulk output
+                # stalls on SSH_MSG_CHANNEL_WINDOW_ADJUST round-trips
+                # while the remote waits for us to extend the window.
+                transport = self.client.get_transport()
+                transport.default_window_size = 2 ** 27
+                transport.default_max_packet_size = 2 ** 19
+
+                # SSH-level keepalive every 15 s: catches dead peers even
+                # when the TCP keepalives above can't (e.g. a NAT box
+                # answering probes for a gone host), and keeps idle NAT
+                # mappings alive.
+                transport.set_keepalive(15)
+
+                stale = None
+                with _POOL_LOCK:
+                    existing = _POOL.get(pool_key)
+                    if existing is not None and existing[1].is_active():
+                        # Lost an insert race with a concurrent fresh
+                        # connect to the same host — keep the first one
+                        # pooled and own ours privately, otherwise the
+                        # overwritten transport (keepalives and all)
+                        # would be stranded with no owner to close it.
+                        self._owns_client = True
+                    else:
+                        stale = existing
+                        _POOL[pool_key] = (self.client, transport)
+                        pooled = True
+                if stale is not None:
+                    try:
+                        stale[0].close()
+                    except Exception:
+                        pass
+
+                # Open interactive shell with PTY
+                self.channel = self.client.invoke_shell(
+                    term="xterm-256color", width=cols, height=rows
                 )
             else:
-                self.client.connect(
-                    host, port=port, username=username, password=password,
-                    timeout=10
+                # Multiplex another shell over the live connection —
+                # no TCP setup, no key exchange, no re-auth
+                self.channel = transport.open_session()
+                self.channel.get_pty(
+                    term="xterm-256color", width=cols, height=rows
                 )
+                self.channel.invoke_shell()
 
-            # Open interactive shell with PTY
-            self.channel = self.client.invoke_shell(
-                term="xterm-256color", width=cols, height=rows
-            )
-            self.channel.settimeout(0.1)
+            # Non-blocking: reads are driven by event-loop readiness on
+            # fileno(), so recv() must never block the caller.
+            self.channel.setblocking(False)
+            # Cache the transport — is_active() runs on the hot read path
+            # and get_transport() is an attribute walk per call
+            self._transport = transport
             self.connected = True
             return True, None
 
-        except paramiko.AuthenticationException:
+        except paramiko.AuthenticationException as e:
+            if not pooled:
+                self._abort_connect(sock)
+            if "timeout" in str(e).lower():
+                return False, "Authentication timed out — server accepted the connection but never finished auth"
             return False, "Authentication failed — check username/password"
         except paramiko.SSHException as e:
+            if not pooled:
+                self._abort_connect(sock)
+            msg = str(e).lower()
+            if "banner" in msg or "no existing session" in msg:
+                # Port open but SSH negotiation never completed within
+                # the timeout — usually something other than sshd
+                # listening there (paramiko reports the late death as
+                # "no existing session" when the timer races the banner
+                # read)
+                return False, "SSH negotiation timed out — is that port really running SSH?"
             return False, f"SSH error: {e}"
         except TimeoutError:
+            if not pooled:
+                self._abort_connect(sock)
             return False, "Connection timed out — check host IP and that SSH is enabled"
         except OSError as e:
+            if not pooled:
+                self._abort_connect(sock)
             return False, f"Connection failed: {e}"
         except Exception as e:
+            if not pooled:
+                self._abort_connect(sock)
             logger.exception("Connect error")
             return False, f"Unexpected error: {e}"
 
+    def _abort_connect(self, sock):
+        """
+        Tear down a fresh connect that failed before its transport was
+        pooled. paramiko's SSHClient.connect does not stop the transport
+        it started when auth or negotiation fails, so a wrong password —
+        routine on a login UI — would otherwise strand a running
+        transport thread and its socket until the remote end gives up.
+        Also covers the socket when key loading raised before
+        client.connect ever ran. Failures after pooling are left to the
+        pool, which evicts and closes dead transports on lookup.
+        """
+        if self.client is not None:
+            try:
+                self.client.close()
+            except Exception:
+                pass
+            self.client = None
+        if sock is not None:
+            # Closing the client closes the socket too when the
+            # transport got as far as owning it; this covers the
+            # pre-transport failure paths, and a second close is a no-op
+            try:
+                sock.close()
+            except Exception:
+                pass
+
+    def new_channel(self, cols=120, rows=30):
+        """
+        Open another PTY shell multiplexed over this manager's live
+        transport and return a fresh SSHManager driving it. SSH runs
+        many channels over one connection, and key exchange + auth is
+        the dominant connect cost — a second terminal to the same host
+        pays only a channel-open round trip. The two managers share the
+        transport; closing one leaves the other (and the pool entry)
+        intact.
+        Raises paramiko.SSHException if the transport is no longer live.
+        """
+        if self._transport is None or not self._transport.is_active():
+            raise paramiko.SSHException("Transport is not active")
+        channel = self._transport.open_session()
+        channel.get_pty(term="xterm-256color", width=cols, height=rows)
+        channel.invoke_shell()
+        channel.setblocking(False)
+        other = SSHManager()
+        other.channel = channel
+        other._transport = self._transport
+        other.connected = True
+        return other
+
+    def fileno(self):
+        """
+        File descriptor that becomes readable when channel data is pending.
+        Lets the server register this manager with loop.add_reader().
+        """
+        return self.channel.fileno()
+
+    async def read_async(self, timeout=None):
+        """
+        Await channel data and return everything buffered — the async
+        face of the event-driven reader. The channel fd is registered
+        with the running loop's selector on first use, so the coroutine
+        sleeps until the kernel reports readiness; there is no polling
+        interval anywhere between a keystroke echo and its delivery.
+
+        Returns the drained bytes, b"" if `timeout` expired first, or
+        None once the channel is closed.
+        """
+        if self._read_event is None:
+            self._read_event = asyncio.Event()
+            self._read_fd = self.fileno()
+            asyncio.get_running_loop().add_reader(
+                self._read_fd, self._read_event.set
+            )
+        if timeout is None:
+            await self._read_event.wait()
+        else:
+            try:
+                await asyncio.wait_for(self._read_event.wait(), timeout)
+            except asyncio.TimeoutError:
+                return b""
+        self._read_event.clear()
+        return self.read()
+
     def read(self):
         """
-        Read available data from the shell channel.
-        Returns bytes (may be empty if nothing available).
+        Drain everything currently buffered on the shell channel.
+        Returns bytes (may be empty if no data is available yet), or
+        None once the channel is closed — swallowing EOF here would
+        leave the caller polling a dead channel forever.
         Non-blocking — returns immediately if no data.
         """
-        if not self.channel:
-            return b""
+        channel = self.channel
+        if not channel:
+            return None
+        # We are the channel's only reader, so drain its inbound
+        # BufferedPipe directly instead of going through recv():
+        # read_ready() is a cheap lock-check gate (no exception
+        # machinery on the empty case), and the flow-control window is
+        # credited once for the whole drain below rather than recv()
+        # doing the bookkeeping — and potentially sending a
+        # WINDOW_ADJUST packet — per 256 KiB chunk.
+        in_buffer = channel.in_buffer
+        chunks = []
+        total = 0
         try:
-            if self.channel.recv_ready():
-                return self.channel.recv(4096)
-        except socket_timeout:
-            pass
-        except Exception:
-            pass
-        return b""
-
-    def write(self, data):
-        """Write raw bytes to the shell channel (user keystrokes)."""
-        if self.channel:
+            while in_buffer.read_ready():
+                chunk = in_buffer.read(262144, 0.0)
+                if not chunk:
+                    # Pipe closed (EOF) — deliver what we have; the
+                    # next read reports the closed channel
+                    break
+                chunks.append(chunk)
+                total += len(chunk)
+        except paramiko.buffered_pipe.PipeTimeout:
+            pass  # No data pending — not an error
+        except (EOFError, paramiko.SSHException, OSError) as e:
+            logger.debug("Channel read failed, closing: %s", e)
+            if not chunks:
+                self.disconnect()
+                return None
+        if total:
+            # Mirror recv()'s post-read window accounting, but settled
+            # once per drain: extend the remote window by everything we
+            # consumed so the sender never stalls waiting on credit.
             try:
-                self.channel.sendall(data)
-            except Exception as e:
-                logger.error(f"Write error: {e}")
+                ack = channel._check_add_window(total)
+                if ack > 0:
+                    m = paramiko.Message()
+                    m.add_byte(paramiko.common.cMSG_CHANNEL_WINDOW_ADJUST)
+                    m.add_int(channel.remote_chanid)
+                    m.add_int(ack)
+                    channel.transport._send_user_message(m)
+            except (EOFError, paramiko.SSHException, OSError) as e:
+                logger.debug("Window adjust failed: %s", e)
+        if not chunks:
+            if channel.closed or channel.eof_received:
+                self.disconnect()
+                return None
+            return b""
+        if len(chunks) == 1:
+            return chunks[0]
+        return b"".join(chunks)
+
+    async def awrite(self, data):
+        """
+        Write raw bytes to the shell channel (user keystrokes) without
+        blocking the event loop.
+
+        Small writes (keystrokes, autorepeat) are coalesced for up to
+        2 ms so one SSH packet — one MAC + encrypt + TCP segment —
+        carries several of them. Large writes (paste payloads) bypass
+        the batching and go out immediately, unless smaller writes are
+        already queued, in which case they join the queue to preserve
+        ordering. Enter (\\r or \\n) flushes immediately: it is the
+        keystroke whose response the user is actually waiting on, so it
+        never eats the 2 ms window. Call flush() to force pending bytes
+        out early.
+
+        This is the only batching delay on the outbound path — the
+        socket has TCP_NODELAY set, so once the SSH packet is written
+        the kernel ships it immediately rather than stacking a Nagle
+        window on top of ours.
+        """
+        if not self.channel:
+            return
+        if self._wbuf or len(data) <= 4096:
+            # Appending into one growing bytearray: each keystroke is a
+            # single in-place copy, and flush sends the buffer as-is
+            # with no per-chunk list bookkeeping or b"".join() pass.
+            self._wbuf.extend(data)
+            if b"\r" in data or b"\n" in data:
+                await self.flush()
+                return
+            if self._wflush_handle is None:
+                self._wflush_handle = asyncio.get_running_loop().call_later(
+                    0.002, lambda: asyncio.ensure_future(self.flush())
+                )
+            return
+        await self._send_all(data)
+
+    async def flush(self):
+        """Send any coalesced writes now (explicit sync point)."""
+        if self._wflush_handle is not None:
+            self._wflush_handle.cancel()
+            self._wflush_handle = None
+        if not self._wbuf:
+            return
+        # Hand the buffer itself to the sender and start a fresh one —
+        # no copy, and writes arriving mid-send land in the new buffer
+        pending = self._wbuf
+        self._wbuf = bytearray()
+        await self._send_all(pending)
+
+    async def _send_all(self, data):
+        """
+        send() on the non-blocking channel takes whatever the SSH send
+        window allows. When the remote window is exhausted (large paste to
+        a slow link), a blocking sendall() would stall every session on
+        the loop; instead yield briefly and retry. Paramiko channels are
+        not real sockets, so there is no fd writability to wait on.
+
+        The lock is held across the whole loop: the yield-retry above
+        suspends mid-buffer, and without it a timer-driven flush and a
+        direct large send could interleave their bytes on the channel.
+        asyncio.Lock wakes waiters FIFO, so sends complete in the order
+        they were issued.
+        """
+        async with self._wlock:
+            view = memoryview(data)
+            while view:
+                try:
+                    sent = self.channel.send(view)
+                except socket_timeout:
+                    # Send window full — let other tasks run, then retry
+                    await asyncio.sleep(0.005)
+                    continue
+                except Exception as e:
+                    logger.error("Write error: %s", e)
+                    return
+                if sent <= 0:
+                    return  # Channel closed
+                view = view[sent:]
 
     def resize(self, cols, rows):
         """Resize the PTY to match the frontend terminal size."""
@@ -125,24 +649,49 @@ class SSHManager:
             try:
                 self.channel.resize_pty(width=cols, height=rows)
             except Exception as e:
-                logger.debug(f"Resize error: {e}")
+                logger.debug("Resize error: %s", e)
 
     def is_active(self):
         """Check if the channel is still alive."""
         if not self.channel:
             return False
-        return not self.channel.closed and self.channel.get_transport() is not None
+        return self._transport is not None and not self.channel.closed
 
     def disconnect(self):
-        """Close the shell channel and SSH connection."""
+        """
+        Close the shell channel. The underlying transport stays alive in
+        the pool so the next session to the same host skips the
+        handshake; dead transports are evicted (and closed) on the next
+        pool lookup.
+        """
+        if self._wflush_handle is not None:
+            self._wflush_handle.cancel()
+            self._wflush_handle = None
+        self._wbuf.clear()
+        if self._read_fd is not None:
+            try:
+                asyncio.get_running_loop().remove_reader(self._read_fd)
+            except Exception:
+                pass
+            self._read_event = None
+            self._read_fd = None
         try:
             if self.channel:
                 self.channel.close()
         except Exception:
             pass
-        try:
-            self.client.close()
-        except Exception:
-            pass
         self.channel = None
+        if self._owns_client:
+            # This transport never made it into the pool (it lost an
+            # insert race) — nobody else will ever close it
+            try:
+                if self.client:
+                    self.client.close()
+            except Exception:
+                pass
+            self._owns_client = False
+        self._transport = None
+        # Drop our reference; the pool keeps the client alive for reuse
+        # and closes it on eviction
+        self.client = None
         self.connected = False